@@ -1,7 +1,7 @@
 #!/usr/bin/python3
 import argparse
 import os.path
-import re
+import multiprocessing
 import networkx
 import glob
 
@@ -40,12 +40,19 @@ import glob
 
 VERBOSE = False
 
-print("""
-RecoPhyNC Copyright (C) 2015 Philippe Gambette
-This program comes with ABSOLUTELY NO WARRANTY.
-This is free software, and you are welcome to redistribute it
-under certain conditions (GNU General Public License).
-""")
+# Inclusions between the network classes: a network which belongs to a class
+# given as a key also belongs to all the classes listed as its value
+IMPLICATIONS = {
+    "tc": ("ntc", "ns"),
+    "ntc": ("gs",),
+    "gs": ("ts", "rv"),
+}
+# The same inclusions read the other way: a network which does not belong to
+# a class given as a key does not belong to any of the classes in its value
+NEGATIVE_IMPLICATIONS = {
+    larger_class: tuple(c for c, larger_classes in IMPLICATIONS.items() if larger_class in larger_classes)
+    for larger_class in {c for larger_classes in IMPLICATIONS.values() for c in larger_classes}
+}
 
 
 # Input: text file containing a list of arcs
@@ -56,10 +63,9 @@ def open_network(filename):
     """
     network = networkx.DiGraph()
     with open(filename) as fd:
-        for line in fd.readlines():  # match patterns of type "vertex1 vertex2"
-            res = re.search("^([^ ]*) ([^ \n\r]*)$", line)
-            if res:
-                network.add_edge(res.group(1), res.group(2))
+        # keep lines of type "vertex1 vertex2"
+        arcs = [line.rstrip("\r\n").split(" ") for line in fd]
+    network.add_edges_from(arc for arc in arcs if len(arc) == 2)
     return network
 
 
@@ -72,27 +78,31 @@ def computeLevel(network):
     :return:
     """
     level = 0
-    undirected = network.to_undirected()
-    for b_nodes, b_edges in zip(networkx.biconnected_components(undirected), networkx.biconnected_component_edges(undirected)):
+    undirected = network.to_undirected(as_view=True)
+    # a single DFS gives the edges of each bi-connected component, from
+    # which its vertices are deduced
+    for b_edges in networkx.biconnected_component_edges(undirected):
         # compute the level of each bi-connected component
         m = len(b_edges)
-        n = len(b_nodes)
+        n = len({v for edge in b_edges for v in edge})
         if m - n + 1 > level:
             level = m - n + 1
     return level
 
 
-# Input: rooted network N
+# Input: children of each vertex of a rooted network N
 # Output: True if N is tree-child, False otherwise
-def isTreeChild(network):
+def isTreeChild(succ_of_n, reticulations_of_n):
     """
-    :param network:
-    :param :
+    :param succ_of_n:
+    :param reticulations_of_n:
     :return:
     """
     all_nodes_tree_child = True
-    for non_leaf in (v for v, degree in network.out_degree() if degree):
-        tree_child_node = any(network.in_degree(c) == 1 for c in network.successors(non_leaf))
+    for non_leaf, children in succ_of_n.items():
+        if not children:
+            continue
+        tree_child_node = any(c not in reticulations_of_n for c in children)
         if not tree_child_node:
             if VERBOSE:
                 print("Vertex", non_leaf, " is not tree-child.")
@@ -100,27 +110,29 @@ def isTreeChild(network):
     return all_nodes_tree_child
 
 
-# Input: rooted network N
-# Output: True if N is tree-child, False otherwise
-def isTreeSibling(network, reticulations_of_n):
+# Input: children and parents of each vertex of a rooted network N
+# Output: True if N is tree-sibling, False otherwise
+def isTreeSibling(succ_of_n, pred_of_n, reticulations_of_n):
     """
-    :param network:
+    :param succ_of_n:
+    :param pred_of_n:
     :param reticulations_of_n:
     :return:
     """
-    all_nodes_tree_sibling = True
     for v in reticulations_of_n:
-        # for each reticulation vertex, we build its set of siblings S
-        siblings = set(c for p in network.predecessors(v) for c in network.successors(p))
-        siblings.discard(v)
-        # we check if S contains at least one tree vertex
+        # for each reticulation vertex, we check if one of its siblings is a
+        # tree vertex, stopping at the first one found; the set of siblings is
+        # only built for display purposes
         if VERBOSE:
+            siblings = set(c for p in pred_of_n[v] for c in succ_of_n[p])
+            siblings.discard(v)
             print("Siblings of", v, ":", siblings)
-        if not any(network.in_degree(s) == 1 for s in siblings):
+        if not any(c not in reticulations_of_n for p in pred_of_n[v] for c in succ_of_n[p]):
             if VERBOSE:
                 print("Vertex", v, "is not tree-sibling.")
-            all_nodes_tree_sibling = False
-    return all_nodes_tree_sibling
+            # one such reticulation is enough
+            return False
+    return True
 
 
 # Input: a rooted phylogenetic network N
@@ -148,17 +160,17 @@ def isReticulationVisible(stable_vertices, reticulations_of_n):
     return ret_visible
 
 
-# Input: a rooted phylogenetic network N
-# Output: True if N is reticulation visible, False otherwise
-def isNearlyStable(network, stable_vertices):
+# Input: parents of each vertex of a rooted phylogenetic network N
+# Output: True if N is nearly stable, False otherwise
+def isNearlyStable(pred_of_n, stable_vertices):
     """
-    :param network:
+    :param pred_of_n:
     :param stable_vertices:
     :return:
     """
     nearly_stable = True
     # skipping dots may improve speed
-    for nonroot in (vertex for vertex, degree in network.in_degree() if degree):
+    for nonroot in (vertex for vertex, parents in pred_of_n.items() if parents):
         if not nearly_stable:
             break
         if VERBOSE:
@@ -167,7 +179,7 @@ def isNearlyStable(network, stable_vertices):
             if VERBOSE:
                 print("Vertex", nonroot, "is not stable.")
             all_predecessors_stable = True
-            for p in network.predecessors(nonroot):
+            for p in pred_of_n[nonroot]:
                 if p not in stable_vertices:
                     all_predecessors_stable = False
                     if VERBOSE:
@@ -183,72 +195,81 @@ def isNearlyStable(network, stable_vertices):
     return nearly_stable
 
 
-# Input: a rooted phylogenetic network N rooted in N and a vertex v
-# Output: True if v is stable in N, False otherwise
-def isStable(v, network, network_root, network_leaves):
-    if VERBOSE:
-        print("Testing if vertex", v, "is stable.")
-
-    if v == network_root:
-        return True
-
-    stable = False
-    network_v = network.copy()
-    network_v.remove_node(v)
-    t = {vertex for vertex in networkx.dfs_tree(network_v, network_root).nodes()}
-    for leaf in network_leaves.difference(t):
-        if VERBOSE:
-            print("Vertex", v, "is stable for", leaf)
-        stable = True
-    if not stable and VERBOSE:
-        print("Vertex", v, "is not stable.")
+# Input: a rooted phylogenetic network N, its root and its set of leaves
+# Output: set of stable vertices of N
+def stableVertices(network, network_root, network_leaves):
+    """
+    :param network:
+    :param network_root:
+    :param network_leaves:
+    :return:
+    """
+    if network_root is None:  # empty network
+        return set()
+    # a vertex is stable if it lies on all paths from the root to some leaf,
+    # i.e. if it dominates this leaf: the stable vertices are thus the leaves
+    # and all their ancestors in the dominator tree of N
+    dominators = networkx.immediate_dominators(network, network_root)
+    stable = {network_root}
+    for leaf in network_leaves:
+        if leaf not in dominators:
+            # removing any vertex leaves this unreachable leaf disconnected
+            return set(network.nodes())
+        v = leaf
+        while v not in stable:
+            if VERBOSE:
+                print("Vertex", v, "is stable for", leaf)
+            stable.add(v)
+            v = dominators[v]
     return stable
 
 
-# Input: a rooted phylogenetic network N
+# Input: parents of each vertex of a rooted phylogenetic network N
 # Output: True if N is compressed, false otherwise
-def isCompressed(network, network_reticulations):
+def isCompressed(pred_of_n, network_reticulations):
     """Returns True if network N is compressed, False otherwise."""
     # skipping dots may improve speed
-    compressed = True
     for reticulation in network_reticulations:
-        for p in (w for w in network.predecessors(reticulation) if network.in_degree(w) > 1):
+        for p in (w for w in pred_of_n[reticulation] if w in network_reticulations):
             if VERBOSE:
                 print("Not compressed: the parent", p,
                       "of reticulation vertex", reticulation,
                       "is also a reticulation vertex.")
-            compressed = False
-    return compressed
+            # one such parent is enough
+            return False
+    return True
 
 
-# Input: a rooted phylogenetic network N
+# Input: children and parents of each vertex of a reticulation-visible rooted phylogenetic network N
 # Output: True if N is nearly tree-child, false otherwise
-def isNearlyTreeChild(network, stable_vertices, reticulations_of_n):
+def isNearlyTreeChild(succ_of_n, pred_of_n, reticulations_of_n, topological_order):
     """
-    :param network:
-    :param stable_vertices:
+    :param succ_of_n:
+    :param pred_of_n:
     :param reticulations_of_n:
+    :param topological_order:
     :return:
     """
-    # First check if N is stable
-    if not isReticulationVisible(stable_vertices, reticulations_of_n):
-        return False
-
+    # N is known to be reticulation-visible here: otherwise it is not
+    # genetically stable, hence not nearly tree-child, and classifyFile
+    # already knows the answer
     nearly_tree_child = True
+    tree_path_vertices = treePathVertices(succ_of_n, reticulations_of_n, topological_order)
     # skipping dots may improve speed
     # let's filter reticulations directly
-    for reticulation in (v for v, d in network.in_degree() if d > 1):
+    for reticulation in reticulations_of_n:
         if not nearly_tree_child:
             break
         # Check if at least one parent of v has the tree path property
         parent_with_tree_path = False
-        for p in network.predecessors(reticulation):
-            if not parent_with_tree_path:
-                visited = set()
-                if VERBOSE:
-                    print("Testing if vertex " + p + " has the tree path property.")
-                if hasTreePath(p, network, visited):
-                    parent_with_tree_path = True
+        for p in pred_of_n[reticulation]:
+            if VERBOSE:
+                print("Testing if vertex", p, "has the tree path property.")
+            if p in tree_path_vertices:
+                parent_with_tree_path = True
+                break
+            if VERBOSE:
+                print("Vertex", p, " does not have the tree path property.")
         if not parent_with_tree_path:
             nearly_tree_child = False
             if VERBOSE:
@@ -257,33 +278,28 @@ def isNearlyTreeChild(network, stable_vertices, reticulations_of_n):
     return nearly_tree_child
 
 
-# Input: a vertex v and a rooted phylogenetic network N
-# Output: True if v has the tree path property in N, else otherwise
-def hasTreePath(v, network, visited):
+# Input: children of each vertex of a rooted phylogenetic network N and a topological order of its vertices
+# Output: set of vertices of N which have the tree path property
+def treePathVertices(succ_of_n, reticulations_of_n, topological_order):
     """
-    :param v:
-    :param network:
-    :param visited:
+    :param succ_of_n:
+    :param reticulations_of_n:
+    :param topological_order:
     :return:
     """
-    has_tp = not network.out_degree(v)
-    # if v is a tree vertex then we check if one of its children has a tree path
-    if v not in visited:
-        visited.add(v)  # visited is now a set (see isNearlyTreeChild)
-        n_in_degree = network.in_degree
-        for tree_successor in (s for s in network.successors(v) if n_in_degree(s) == 1):
-            has_tp = hasTreePath(tree_successor, network, visited)
-            if has_tp:
-                break
-
-    if not has_tp and VERBOSE:
-        print("Vertex", v, " does not have the tree path property.")
-    return has_tp
+    # a vertex has the tree path property if it is a leaf or if one of its
+    # tree children has it, so we go up from the leaves in a single pass
+    tree_path_vertices = set()
+    for v in reversed(topological_order):
+        children = succ_of_n[v]
+        if not children or any(c in tree_path_vertices for c in children if c not in reticulations_of_n):
+            tree_path_vertices.add(v)
+    return tree_path_vertices
 
 
-# Input: a rooted phylogenetic network N
+# Input: parents of each vertex of a rooted phylogenetic network N
 # Output: True if N is genetically stable, False otherwise
-def isGeneticallyStable(network, stable_vertices, reticulations_of_n):
+def isGeneticallyStable(pred_of_n, stable_vertices, reticulations_of_n):
     gen_stable = True
     for reticulation in reticulations_of_n:
         if not gen_stable:
@@ -297,7 +313,7 @@ def isGeneticallyStable(network, stable_vertices, reticulations_of_n):
                 print("Vertex", reticulation, "is stable, testing if its parents are stable.")
             one_parent_stable = False
             # let's filter stable predecessors directly
-            for stable_predecessor in (v for v in network.predecessors(reticulation) if v in stable_vertices):
+            for stable_predecessor in (v for v in pred_of_n[reticulation] if v in stable_vertices):
                 one_parent_stable = True
                 if VERBOSE:
                     print("Parent", stable_predecessor, "is stable.")
@@ -306,16 +322,25 @@ def isGeneticallyStable(network, stable_vertices, reticulations_of_n):
     return gen_stable
 
 
-# Input: a rooted phylogenetic network N
-# Output: N's root
-def root(network):
+# Input: children and parents of each vertex of a rooted phylogenetic network N
+# Output: N's root, set of leaves of N and set of reticulations of N
+def rootLeavesReticulations(succ_of_n, pred_of_n):
     """
-    :param network:
+    :param succ_of_n:
+    :param pred_of_n:
     :return:
     """
-    for vertex, degree in network.in_degree():
-        if not degree:
-            return vertex
+    network_root = None
+    network_leaves = set()
+    network_reticulations = set()
+    for vertex, parents in pred_of_n.items():
+        if len(parents) > 1:
+            network_reticulations.add(vertex)
+        elif not parents and network_root is None:
+            network_root = vertex
+        if not succ_of_n[vertex]:
+            network_leaves.add(vertex)
+    return network_root, network_leaves, network_reticulations
 
 
 # Input: a rooted phylogenetic network N
@@ -325,37 +350,255 @@ def contract(network):
     :param network:
     :return:
     """
-    found_candidate = True
-    n_in_degree = network.in_degree()
-    n_out_degree = network.out_degree()
-    n_nodes = list(network.nodes())
-    while found_candidate:
-        found_candidate = False
-        for vertex in (v for v in n_nodes if n_in_degree(v) == 1 and n_out_degree(v) == 1):
-            if VERBOSE:
-                print(vertex, "was an in-degree 1 out-degree 1 vertex")
-            network.add_edge(list(network.predecessors(vertex))[0], list(network.successors(vertex))[0])
-            network.remove_node(vertex)
-            found_candidate = True
-
-
-# Input: a rooted phylogenetic network N
-# Output: set of leaves of N
-def leaves(network):
+    n_succ = network.succ
+    n_pred = network.pred
+    candidates = [v for v in network.nodes() if len(n_pred[v]) == 1 and len(n_succ[v]) == 1]
+    while candidates:
+        # replace each maximal path of in-degree 1 out-degree 1 vertices by a
+        # single arc between the vertices found at both ends of the path
+        in_path = set(candidates)
+        new_arcs = []
+        contracted = []
+        for vertex in candidates:
+            top = next(iter(n_pred[vertex]))
+            if top in in_path:
+                continue
+            bottom = vertex
+            while bottom in in_path:
+                if VERBOSE:
+                    print(bottom, "was an in-degree 1 out-degree 1 vertex")
+                contracted.append(bottom)
+                bottom = next(iter(n_succ[bottom]))
+            new_arcs.append((top, bottom))
+        network.remove_nodes_from(contracted)
+        network.add_edges_from(new_arcs)
+        # a new arc may already exist, in which case both its ends lose a
+        # neighbour and may have become in-degree 1 out-degree 1 vertices
+        candidates = [v for v in {v for arc in new_arcs for v in arc} if len(n_pred[v]) == 1 and len(n_succ[v]) == 1]
+
+
+# Input: the classes already identified for a network N, a class and whether N belongs to it
+# Output: the classes of N updated with this class and all the classes it implies
+def setClass(n_classification, network_class, belongs):
     """
-    :param network:
+    :param n_classification:
+    :param network_class:
+    :param belongs:
     :return:
     """
-    return {vertex for vertex, degree in network.out_degree() if not degree}
+    n_classification[network_class] = belongs
+    if belongs:
+        # N also belongs to all the classes containing this class
+        implied_classes = IMPLICATIONS.get(network_class, ())
+    else:
+        # N does not belong to any class contained in this class
+        implied_classes = NEGATIVE_IMPLICATIONS.get(network_class, ())
+    for implied_class in implied_classes:
+        if implied_class not in n_classification:
+            setClass(n_classification, implied_class, belongs)
+
+
+# Input: path to a file containing a list of arcs
+# Output: line of the CSV output describing the classes of the network in this file,
+# None if the arcs in this file contain a directed cycle
+def classifyFile(data_file):
+    """
+    :param data_file:
+    :return:
+    """
+    # network initialization and preprocessing
+    print("Treating file", data_file)
+    network = open_network(data_file)
+    # the classes are only defined for acyclic networks, and a cycle would
+    # stop the topological sort below, hence the whole run
+    if not networkx.is_directed_acyclic_graph(network):
+        print("Skipping file", data_file, ": the network contains a directed cycle.")
+        return None
+    contract(network)
+    # the classification functions only read the children and the
+    # parents of each vertex, which are faster to go through in plain
+    # dicts of lists than in NetworkX's views
+    succ_of_n = {v: list(children) for v, children in network.succ.items()}
+    pred_of_n = {v: list(parents) for v, parents in network.pred.items()}
+
+    # store identified classes and useful properties in a dictionary,
+    # so we can use previously acquired knowledge to speed things up
+    # (i.e., if we know that network is tree-child, then we know it's also
+    # nearly tree-child so no need to ask a function for the result);
+    # classes must be stored with setClass to propagate IMPLICATIONS
+    n_classification = dict()
+
+    # compute stable vertices
+    if VERBOSE:
+        print("""== Computing the stable vertices ==""")
+    # t0=datetime.datetime.now()
+    # knowing the root, the leaves, the reticulations and a topological
+    # order is useful at various stages, so let's compute all of that
+    # only once
+    root_n, leaves_of_n, reticulations_of_n = rootLeavesReticulations(succ_of_n, pred_of_n)
+    order_of_n = list(networkx.topological_sort(network))
+    stable_vertices = stableVertices(network, root_n, leaves_of_n)
 
+    if VERBOSE:
+        print("Stable vertices of network:", stable_vertices)
+        print("""===================================""")
+    # print "Time Stable vertices: "+str((datetime.datetime.now()-t0).microseconds)+"ms."
 
-def reticulations(network):
-    """Returns the set of reticulations in N."""
-    return {vertex for vertex, degree in network.in_degree() if degree > 1}
+    fields = [data_file]
+    if VERBOSE:
+        print("Edges of network: ", network.edges())
+
+    # level
+    # t0 = datetime.datetime.now()
+    level = computeLevel(network)
+    if VERBOSE:
+        print("Level of network:", level)
+        print("""""")
+    n_classification["level"] = level
+    fields.append(str(level))
+    # print "Time Level: "+str((datetime.datetime.now()-t0).microseconds)+"ms."
+
+    # reticulation-visibility only takes one lookup per reticulation, so
+    # it is always decided first: when the network is not
+    # reticulation-visible, it is neither genetically stable, nor nearly
+    # tree-child, nor tree-child, and these tests are skipped
+    setClass(n_classification, "rv", isReticulationVisible(stable_vertices, reticulations_of_n))
+
+    # tree-child
+    # t0 = datetime.datetime.now()
+    if "tc" not in n_classification:
+        setClass(n_classification, "tc", level == 1 or isTreeChild(succ_of_n, reticulations_of_n))
+    if n_classification["tc"]:
+        if VERBOSE:
+            print("""== network is tree-child.==""")
+        fields.append("tc")
+    else:
+        if VERBOSE:
+            print("""== network is not tree-child. ==""")
+        fields.append("not tc")
+    # print "Time Tree-child: "+str((datetime.datetime.now()-t0).microseconds)+"ms."
+
+    # nearly tree-child
+    # t0=datetime.datetime.now()
+    if "ntc" not in n_classification:
+        setClass(n_classification, "ntc", isNearlyTreeChild(succ_of_n, pred_of_n, reticulations_of_n, order_of_n))
+    ntc = n_classification["ntc"]
+    if VERBOSE:
+        if ntc:
+            print("""== network is nearly tree-child. ==""")
+        else:
+            print("""== network is not nearly tree-child. ==""")
+    if ntc:
+        fields.append("ntc")
+    else:
+        fields.append("not ntc")
+    # print "Time Nearly tree-child: "+str((datetime.datetime.now()-t0).microseconds)+"ms."
+
+    # genetically stable
+    # t0=datetime.datetime.now()
+    if "gs" not in n_classification:
+        setClass(n_classification, "gs", isGeneticallyStable(pred_of_n, stable_vertices, reticulations_of_n))
+    gen_stab = n_classification["gs"]
+    if VERBOSE:
+        if gen_stab:
+            print("""== network is genetically stable. ==""")
+        else:
+            print("""== network is not genetically stable. ==""")
+    if gen_stab:
+        fields.append("gs")
+    else:
+        fields.append("not gs")
+    # print "Time Genetically stable: "+str((datetime.datetime.now()-t0).microseconds)+"ms."
+
+    # tree-sibling
+    # t0=datetime.datetime.now()
+
+    if "ts" not in n_classification:
+        setClass(n_classification, "ts", isTreeSibling(succ_of_n, pred_of_n, reticulations_of_n))
+    tr_sib = n_classification["ts"]
+    if VERBOSE:
+        if tr_sib:
+            print("""== network is tree-sibling. ==""")
+        else:
+            print("""== network is not tree-sibling. ==""")
+    if tr_sib:
+        fields.append("ts")
+    else:
+        fields.append("not ts")
+
+    # print "Time Tree-sibling: " +str((datetime.datetime.now()-t0).microseconds) + "ms."
+
+    # reticulation-visible
+    # (decided before all the other classes)
+    ret_vis = n_classification["rv"]
+    if VERBOSE:
+        if ret_vis:
+            print("""== network is reticulation visible. ==""")
+        else:
+            print("""== network is not reticulation visible. ==""")
+    if ret_vis:
+        fields.append("rv")
+    else:
+        fields.append("not rv")
+    # print "Time Reticulation-visible: "+str((datetime.datetime.now()-t0).microseconds)+"ms."
+
+    # compressed
+    # t0 = datetime.datetime.now()
+    if "cp" not in n_classification:
+        setClass(n_classification, "cp", isCompressed(pred_of_n, reticulations_of_n))
+    comp = n_classification["cp"]
+    if VERBOSE:
+        if comp:
+            print("""== network is compressed. ==""")
+        else:
+            print("""== network is not compressed. ==""")
+    if comp:
+        fields.append("cp")
+    else:
+        fields.append("not cp")
+    # print "Time Compressed: "+str((datetime.datetime.now() - t0).microseconds)+"ms."
+
+    # nearly-stable
+    # t0 = datetime.datetime.now()
+    if "ns" not in n_classification:
+        setClass(n_classification, "ns", isNearlyStable(pred_of_n, stable_vertices))
+    ns = n_classification["ns"]
+    if VERBOSE:
+        if ns:
+            print("""== network is nearly stable. ==""")
+        else:
+            print("""== network is not nearly stable. ==""")
+    if ns:
+        fields.append("ns")
+    else:
+        fields.append("not ns")
+    # print "Time Compressed: " + str((datetime.datetime.now() - t0).microseconds)+"ms."
+
+    # information about the network
+    return ",".join(fields)
+
+
+# Input: whether the verbose mode is enabled
+# Output: none, sets the verbose mode of the current process
+def setVerbose(verbose):
+    """
+    :param verbose:
+    :return:
+    """
+    global VERBOSE
+    VERBOSE = verbose
 
 
 def main():
     """The main part of the program."""
+    # printed here rather than at import time, so that the processes started
+    # by multiprocessing do not print it again
+    print("""
+RecoPhyNC Copyright (C) 2015 Philippe Gambette
+This program comes with ABSOLUTELY NO WARRANTY.
+This is free software, and you are welcome to redistribute it
+under certain conditions (GNU General Public License).
+""")
     # build argument parser and parse arguments -------------------------------
     global VERBOSE
     parser = argparse.ArgumentParser(
@@ -368,6 +611,10 @@ def main():
         '-f', type=str, dest='folder',
         help='the path to the folder that contains the data files'
     )
+    parser.add_argument(
+        '-p', type=int, dest='processes', default=1,
+        help='the number of processes used to classify the networks'
+    )
     parser.add_argument(
         '--verbose', action='store_true', help="verbose mode"
     )
@@ -380,164 +627,24 @@ def main():
     file_filter = "*"
 
     # read all data files in specified folder and classify networks -----------
-    with open(os.path.join(folder, "results2.csv"), "w+") as output:
+    # a large buffer keeps the number of writes low when there are many networks
+    with open(os.path.join(folder, "results2.csv"), "w+", buffering=1 << 20) as output:
         output.write('file,level,tree-child,nearly tree-child,genetically stable,tree-sibling,reticulation-visible,'
                      'compressed,nearly stable\n')
-        for data_file in glob.glob(os.path.join(folder, "data", file_filter)):
-            # network initialization and preprocessing
-            print("Treating file", data_file)
-            network = open_network(data_file)
-            contract(network)
-
-            # store identified classes and useful properties in a dictionary,
-            # so we can use previously acquired knowledge to speed things up
-            # (i.e., if we know that network is tree-child, then we know it's also
-            # nearly tree-child so no need to ask a function for the result)
-            n_classification = dict()
-
-            # compute stable vertices
-            if VERBOSE:
-                print("""== Computing the stable vertices ==""")
-            # t0=datetime.datetime.now()
-            # knowing the root, the leaves and the reticulations is useful at
-            # various stages, so let's compute all of that only once
-            root_n = root(network)
-            leaves_of_n = leaves(network)
-            reticulations_of_n = reticulations(network)
-            stable_vertices = {
-                v for v in network.nodes() if
-                not (network.out_degree and network.in_degree and not isStable(v, network, root_n, leaves_of_n))
-            }
-
-            if VERBOSE:
-                print("Stable vertices of network:", stable_vertices)
-                print("""===================================""")
-            # print "Time Stable vertices: "+str((datetime.datetime.now()-t0).microseconds)+"ms."
-
-            line = data_file
-            if VERBOSE:
-                print("Edges of network: ", network.edges())
-
-            # level
-            # t0 = datetime.datetime.now()
-            level = computeLevel(network)
-            if VERBOSE:
-                print("Level of network:", level)
-                print("""""")
-            n_classification["level"] = level
-            line = ''.join((line, ",", str(level)))  # join is faster
-            # print "Time Level: "+str((datetime.datetime.now()-t0).microseconds)+"ms."
-
-            # tree-child
-            # t0 = datetime.datetime.now()
-            n_classification["tc"] = n_classification.get("level", -1) == 1 or isTreeChild(network)
-            if n_classification["tc"]:
-                if VERBOSE:
-                    print("""== network is tree-child.==""")
-                line = ''.join((line, ",tc"))
-            else:
-                if VERBOSE:
-                    print("""== network is not tree-child. ==""")
-                line = ''.join((line, ",not tc"))
-            # print "Time Tree-child: "+str((datetime.datetime.now()-t0).microseconds)+"ms."
-
-            # nearly tree-child
-            # t0=datetime.datetime.now()
-            ntc = n_classification.get("tc", False) or isNearlyTreeChild(network, stable_vertices, reticulations_of_n)
-            n_classification["ntc"] = ntc
-            if VERBOSE:
-                if ntc:
-                    print("""== network is nearly tree-child. ==""")
-                else:
-                    print("""== network is not nearly tree-child. ==""")
-            if ntc:
-                line = ''.join((line, ",ntc"))
-            else:
-                line = ''.join((line, ",not ntc"))
-            # print "Time Nearly tree-child: "+str((datetime.datetime.now()-t0).microseconds)+"ms."
-
-            # genetically stable
-            # t0=datetime.datetime.now()
-            gen_stab = n_classification.get("ntc", False) or isGeneticallyStable(network, stable_vertices,
-                                                                                 reticulations_of_n)
-            n_classification["gs"] = gen_stab
-            if VERBOSE:
-                if gen_stab:
-                    print("""== network is genetically stable. ==""")
-                else:
-                    print("""== network is not genetically stable. ==""")
-            if gen_stab:
-                line = ''.join((line, ",gs"))
-            else:
-                line = ''.join((line, ",not gs"))
-            # print "Time Genetically stable: "+str((datetime.datetime.now()-t0).microseconds)+"ms."
-
-            # tree-sibling
-            # t0=datetime.datetime.now()
-
-            tr_sib = n_classification.get("gs", False) or isTreeSibling(network, reticulations_of_n)
-            n_classification["ts"] = tr_sib
-            if VERBOSE:
-                if tr_sib:
-                    print("""== network is tree-sibling. ==""")
-                else:
-                    print("""== network is not tree-sibling. ==""")
-            if tr_sib:
-                line = ''.join((line, ",ts"))
-            else:
-                line = ''.join((line, ",not ts"))
-
-            # print "Time Tree-sibling: " +str((datetime.datetime.now()-t0).microseconds) + "ms."
-
-            # reticulation-visible
-            # t0 = datetime.datetime.now()
-            ret_vis = n_classification.get("gs", False) or isReticulationVisible(
-                stable_vertices, reticulations_of_n
-            )
-            n_classification["rv"] = ret_vis
-            if VERBOSE:
-                if ret_vis:
-                    print("""== network is reticulation visible. ==""")
-                else:
-                    print("""== network is not reticulation visible. ==""")
-            if ret_vis:
-                line = ''.join((line, ",rv"))
-            else:
-                line = ''.join((line, ",not rv"))
-            # print "Time Reticulation-visible: "+str((datetime.datetime.now()-t0).microseconds)+"ms."
-
-            # compressed
-            # t0 = datetime.datetime.now()
-            comp = isCompressed(network, reticulations_of_n)
-            n_classification["cp"] = comp
-            if VERBOSE:
-                if comp:
-                    print("""== network is compressed. ==""")
-                else:
-                    print("""== network is not compressed. ==""")
-            if comp:
-                line = ''.join((line, ",cp"))
-            else:
-                line = ''.join((line, ",not cp"))
-            # print "Time Compressed: "+str((datetime.datetime.now() - t0).microseconds)+"ms."
-
-            # nearly-stable
-            # t0 = datetime.datetime.now()
-            ns = n_classification.get("tc", False) or isNearlyStable(network, stable_vertices)
-            n_classification["ns"] = ns
-            if VERBOSE:
-                if ns:
-                    print("""== network is nearly stable. ==""")
-                else:
-                    print("""== network is not nearly stable. ==""")
-            if ns:
-                line = ''.join((line, ",ns"))
-            else:
-                line = ''.join((line, ",not ns"))
-            # print "Time Compressed: " + str((datetime.datetime.now() - t0).microseconds)+"ms."
-
-            # write information about the network
-            output.write(line + "\n")
+        data_files = glob.glob(os.path.join(folder, "data", file_filter))
+        if arguments.processes > 1:
+            # networks are classified independently from each other, so they
+            # can be spread over several processes; imap keeps the file order
+            # and sending the files by small batches limits the messages
+            with multiprocessing.Pool(arguments.processes, initializer=setVerbose, initargs=(VERBOSE,)) as pool:
+                for line in pool.imap(classifyFile, data_files, chunksize=4):
+                    if line is not None:
+                        output.write(line + "\n")
+        else:
+            for data_file in data_files:
+                line = classifyFile(data_file)
+                if line is not None:
+                    output.write(line + "\n")
 
 
 if __name__ == '__main__':